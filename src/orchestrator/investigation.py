@@ -48,7 +48,7 @@ def execute_investigation(issue_id: str) -> InvestigationResult:
         - error field contains error message
         - Partial data (findings, recommendations) preserved when possible
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     investigation_logger = logging.getLogger(f"investigation.{issue_id}")
 
     try:
@@ -78,17 +78,21 @@ def execute_investigation(issue_id: str) -> InvestigationResult:
         # Step 6: Record new patterns to learning store
         investigation_logger.info("Recording patterns to learning store")
         confidence_map = {"low": 0.3, "medium": 0.6, "high": 0.9}
-        for recommendation in recommendations:
-            if confidence_map[recommendation.confidence] >= 0.7:  # Only record high-confidence patterns
-                pattern_store.record_pattern(
-                    issue_pattern=recommendation.recommendation,
-                    recommendation=recommendation.reasoning,
-                    citations=recommendation.citations,
-                    outcome=None,  # Will be updated when issue closes
-                )
+        pattern_store.record_patterns(
+            [
+                {
+                    "issue_pattern": recommendation.recommendation,
+                    "recommendation": recommendation.reasoning,
+                    "citations": recommendation.citations,
+                    "outcome": None,  # Will be updated when issue closes
+                }
+                for recommendation in recommendations
+                if confidence_map[recommendation.confidence] >= 0.7  # Only record high-confidence patterns
+            ]
+        )
 
         # Step 7: Build InvestigationResult
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         citations_count = sum(len(f.citations) for f in findings) + sum(len(r.citations) for r in recommendations)
 
         result = InvestigationResult(
@@ -112,7 +116,7 @@ def execute_investigation(issue_id: str) -> InvestigationResult:
         return result
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         investigation_logger.error(f"Investigation failed: {e}", exc_info=True)
 
         # Return partial results with error
@@ -313,15 +317,14 @@ def _generate_recommendations(
     return recommendations
 
 
-def _save_investigation(result: InvestigationResult, logger: logging.Logger) -> None:
-    """Save investigation result to markdown file.
+def _render_investigation_markdown(result: InvestigationResult) -> str:
+    """Render investigation result as markdown.
 
     Args:
-        result: InvestigationResult to save
-        logger: Logger instance
+        result: InvestigationResult to render
 
-    Output Path:
-        investigation_results/{issue_id}.md
+    Returns:
+        Markdown document with findings, recommendations, and pattern matches
 
     Markdown Format:
         ## Investigation: {issue_id}
@@ -344,22 +347,7 @@ def _save_investigation(result: InvestigationResult, logger: logging.Logger) ->
         ---
         *Generated by Orchestrator Investigation*
         *Duration: {duration}s | Citations: {count} | Patterns: {count}*
-
-    Implementation:
-        1. Create output_dir = Path("investigation_results"), mkdir with parents=True, exist_ok=True
-        2. Build markdown content with sections
-        3. Use CitationTracker to format findings and recommendations
-        4. Write to output_path = output_dir / f"{result.issue_id}.md"
-        5. Log success
-
-    Error Handling:
-        - Let exceptions propagate (file I/O errors should be visible)
     """
-    # Create output directory
-    output_dir = Path("investigation_results")
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Build markdown content
     tracker = CitationTracker()
     content_parts = [
         f"## Investigation: {result.issue_id}\n",
@@ -411,8 +399,34 @@ def _save_investigation(result: InvestigationResult, logger: logging.Logger) ->
         ]
     )
 
+    return "".join(content_parts)
+
+
+def _save_investigation(result: InvestigationResult, logger: logging.Logger) -> None:
+    """Save investigation result to markdown file.
+
+    Args:
+        result: InvestigationResult to save
+        logger: Logger instance
+
+    Output Path:
+        investigation_results/{issue_id}.md
+
+    Implementation:
+        1. Create output_dir = Path("investigation_results"), mkdir with parents=True, exist_ok=True
+        2. Render markdown content via _render_investigation_markdown
+        3. Write to output_path = output_dir / f"{result.issue_id}.md"
+        4. Log success
+
+    Error Handling:
+        - Let exceptions propagate (file I/O errors should be visible)
+    """
+    # Create output directory
+    output_dir = Path("investigation_results")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
     # Write to file
     output_path = output_dir / f"{result.issue_id}.md"
-    output_path.write_text("".join(content_parts), encoding="utf-8")
+    output_path.write_text(_render_investigation_markdown(result), encoding="utf-8")
 
     logger.info(f"Investigation saved to {output_path}")
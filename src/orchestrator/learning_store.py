@@ -1,13 +1,19 @@
 """Pattern learning and matching for investigation workflow."""
 
+import functools
 import hashlib
-import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from orchestrator.models import Citation, PatternMatch
 
+READ_BUFFER_SIZE = 1 << 20  # 1 MiB read buffer for streaming JSONL scans
+MATCH_CACHE_SIZE = 512  # Distinct (description, min_confidence) queries cached per store
+
 
 class LearningStore:
     """File-based pattern learning store for investigation insights."""
@@ -19,6 +25,11 @@ class LearningStore:
             patterns_file: Path to JSONL patterns file (default: data/patterns.jsonl)
         """
         self.patterns_file = Path(patterns_file)
+        self.delta_file = self.patterns_file.with_suffix(".delta.jsonl")
+        # Per-instance cache (not a decorated method) so entries die with the store
+        self._find_cached = functools.lru_cache(maxsize=MATCH_CACHE_SIZE)(self._find_uncached)
+        self._patterns: list[dict[str, Any]] = []
+        self._patterns_state: tuple | None = None  # State token the loaded records reflect
         self._ensure_data_directory()
 
     def _ensure_data_directory(self: "LearningStore") -> None:
@@ -43,44 +54,47 @@ class LearningStore:
         Returns:
             Pattern ID (generated from timestamp + hash)
         """
-        # Generate pattern ID
-        timestamp = datetime.utcnow().isoformat()
-        pattern_id = f"P-{hashlib.md5(f'{timestamp}{issue_pattern}'.encode()).hexdigest()[:8]}"
-
-        # Create pattern record
-        pattern = {
-            "pattern_id": pattern_id,
-            "issue_pattern": issue_pattern,
-            "recommendation": recommendation,
-            "citations": [
+        return self.record_patterns(
+            [
                 {
-                    "source_type": c.source_type,
-                    "source_id": c.source_id,
-                    "source_url": c.source_url,
-                    "excerpt": c.excerpt,
-                    "retrieved_at": c.retrieved_at,
+                    "issue_pattern": issue_pattern,
+                    "recommendation": recommendation,
+                    "citations": citations,
+                    "outcome": outcome,
                 }
-                for c in citations
-            ],
-            "outcome": outcome,
-            "successful_resolutions": 1 if outcome == "resolved" else 0,
-            "total_uses": 1,
-            "confidence": 1.0 if outcome == "resolved" else 0.5,  # Start at 0.5 if unresolved
-            "created_at": timestamp,
-            "updated_at": timestamp,
-        }
+            ]
+        )[0]
+
+    def record_patterns(self: "LearningStore", records: list[dict[str, Any]]) -> list[str]:
+        """Record several patterns with a single append to the patterns file.
+
+        Args:
+            records: Dicts with record_pattern's arguments (issue_pattern,
+                recommendation, citations, and optional outcome)
+
+        Returns:
+            Pattern IDs in the same order as records
+        """
+        if not records:
+            return []
+
+        patterns = [
+            _build_pattern(r["issue_pattern"], r["recommendation"], r["citations"], r.get("outcome")) for r in records
+        ]
 
         # Append to JSONL file
-        with open(self.patterns_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(pattern, ensure_ascii=False) + "\n")
+        _append(self.patterns_file, b"".join(_dump_pattern(pattern) for pattern in patterns))
 
-        return pattern_id
+        return [pattern["pattern_id"] for pattern in patterns]
 
     def find_matching_patterns(
         self: "LearningStore", issue_description: str, min_confidence: float = 0.7
     ) -> list[PatternMatch]:
         """Find patterns matching the issue description.
 
+        Results are cached per case-folded query and invalidated whenever the
+        patterns file or delta log changes on disk.
+
         Args:
             issue_description: Description of the current issue
             min_confidence: Minimum confidence threshold (default: 0.7)
@@ -88,85 +102,317 @@ class LearningStore:
         Returns:
             List of PatternMatch objects with confidence ≥ min_confidence
         """
-        if not self.patterns_file.exists():
-            return []
-
         matches: list[PatternMatch] = []
 
-        # Read all patterns from JSONL
-        with open(self.patterns_file, encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
-
-                pattern = json.loads(line)
-
-                # Simple text similarity (contains check)
-                # More sophisticated similarity could be added later
-                if (
-                    issue_description.lower() in pattern["issue_pattern"].lower()
-                    or pattern["issue_pattern"].lower() in issue_description.lower()
-                ) and pattern["confidence"] >= min_confidence:
-                    # Convert citations back to Citation objects
-                    citations = [Citation(**c) for c in pattern.get("citations", [])]
-
-                    matches.append(
-                        PatternMatch(
-                            pattern_id=pattern["pattern_id"],
-                            description=pattern["issue_pattern"],
-                            confidence=pattern["confidence"],
-                            successful_resolutions=pattern["successful_resolutions"],
-                            citations=citations,
-                        )
-                    )
-
-        # Sort by confidence descending
-        matches.sort(key=lambda m: m.confidence, reverse=True)
+        # Matching is case-insensitive, so case variants share one cache entry
+        # The cache holds raw records; each caller gets its own PatternMatch objects
+        for pattern in self._find_cached(issue_description.lower(), min_confidence, self._state_token()):
+            # Convert citations back to Citation objects
+            citations = [Citation(**c) for c in pattern.get("citations", [])]
+
+            matches.append(
+                PatternMatch(
+                    pattern_id=pattern["pattern_id"],
+                    description=pattern["issue_pattern"],
+                    confidence=pattern["confidence"],
+                    successful_resolutions=pattern["successful_resolutions"],
+                    citations=citations,
+                )
+            )
+
         return matches
 
+    def _find_uncached(
+        self: "LearningStore", issue_description: str, min_confidence: float, state: tuple
+    ) -> tuple[dict[str, Any], ...]:
+        """Scan the loaded pattern records for the given store state."""
+        # Simple text similarity (contains check)
+        # More sophisticated similarity could be added later
+        return tuple(_scan(self._current_patterns(state), issue_description, min_confidence))
+
+    def _current_patterns(self: "LearningStore", state: tuple) -> list[dict[str, Any]]:
+        """Return the pattern records for state, reloading them if the store changed on disk."""
+        if self._patterns_state != state:
+            patterns, self._patterns_state = self._load_current()
+            self._patterns = list(patterns.values())
+        return self._patterns
+
+    def _state_token(self: "LearningStore") -> tuple:
+        """Identify the on-disk state of the store; any write produces a new token."""
+        return (_file_signature(self.patterns_file), _file_signature(self.delta_file))
+
     def update_outcome(self: "LearningStore", pattern_id: str, outcome: str) -> bool:
         """Update a pattern's outcome when issue is resolved.
 
+        Appends a delta record to the sidecar delta log without reading the
+        store, so the cost does not grow with the pattern count. Deltas are
+        folded into patterns on read, where deltas for unknown pattern IDs are
+        skipped (and dropped at compaction). A load compacts the store once
+        the delta log has grown past half the pattern count.
+
         Args:
             pattern_id: Pattern ID to update
             outcome: Resolution outcome ("resolved" or "not_resolved")
 
         Returns:
-            True if pattern was found and updated, False otherwise
+            True once the delta is recorded, False if no patterns exist yet
         """
         if not self.patterns_file.exists():
             return False
 
-        # Read all patterns
-        patterns: list[dict[str, Any]] = []
-        updated = False
+        delta = {"pattern_id": pattern_id, "outcome": outcome, "updated_at": datetime.utcnow().isoformat()}
+        _append(self.delta_file, orjson.dumps(delta) + b"\n")
+        return True
+
+    def compact(self: "LearningStore") -> None:
+        """Fold the delta log into the patterns file and remove it."""
+        patterns, delta_count, signature = self._load_patterns()
+        if delta_count:
+            self._write_compacted(patterns, signature)
+
+    def _load_pattern(self: "LearningStore", pattern_id: str) -> dict[str, Any] | None:
+        """Load a single pattern with all outcome deltas applied."""
+        patterns, _, _ = self._load_patterns()
+        return patterns.get(pattern_id)
 
-        with open(self.patterns_file, encoding="utf-8") as f:
-            for line in f:
-                if not line.strip():
-                    continue
+    def _load_current(self: "LearningStore") -> tuple[dict[str, dict[str, Any]], tuple]:
+        """Load patterns for matching, compacting once deltas outnumber half the patterns.
 
-                pattern = json.loads(line)
+        Returns:
+            Tuple of (patterns in file order, state token for what they reflect)
+        """
+        patterns, delta_count, signature = self._load_patterns()
+        if delta_count > len(patterns) / 2:
+            signature = self._write_compacted(patterns, signature)
+        return patterns, signature
 
-                # Update matching pattern
-                if pattern["pattern_id"] == pattern_id:
-                    pattern["outcome"] = outcome
-                    pattern["total_uses"] += 1
+    def _load_patterns(self: "LearningStore") -> tuple[dict[str, dict[str, Any]], int, tuple]:
+        """Load patterns keyed by ID with the delta log replayed on top.
 
-                    if outcome == "resolved":
-                        pattern["successful_resolutions"] += 1
+        Returns:
+            Tuple of (patterns in file order, number of delta records replayed,
+            state token for the bytes actually read)
+        """
+        records, file_signature = _read_jsonl_if_exists(self.patterns_file)
+        patterns = {pattern["pattern_id"]: pattern for pattern in records}
 
-                    # Update confidence: successful_resolutions / total_uses
-                    pattern["confidence"] = pattern["successful_resolutions"] / pattern["total_uses"]
-                    pattern["updated_at"] = datetime.utcnow().isoformat()
-                    updated = True
+        # Folding logs of an interrupted compaction still count until it replaces this file
+        deltas = []
+        for folding_file in self._folding_files(file_signature[0]) if file_signature else ():
+            deltas.extend(_read_jsonl_if_exists(folding_file)[0])
+        live_deltas, delta_signature = _read_jsonl_if_exists(self.delta_file)
+        deltas.extend(live_deltas)
 
-                patterns.append(pattern)
+        for delta in deltas:
+            if delta["pattern_id"] in patterns:
+                _apply_outcome(patterns[delta["pattern_id"]], delta)
 
-        if updated:
-            # Rewrite entire file with updated pattern
-            with open(self.patterns_file, "w", encoding="utf-8") as f:
-                for pattern in patterns:
-                    f.write(json.dumps(pattern, ensure_ascii=False) + "\n")
+        # Confidence is derived from resolution counts, never trusted from disk
+        for pattern in patterns.values():
+            pattern["confidence"] = _confidence(pattern)
 
-        return updated
+        return patterns, len(deltas), (file_signature, delta_signature)
+
+    def _write_compacted(self: "LearningStore", patterns: dict[str, dict[str, Any]], signature: tuple) -> tuple:
+        """Replace the patterns file with folded patterns and retire the delta log.
+
+        The delta log is first renamed to a folding log tagged with the
+        patterns file's inode, so outcomes recorded meanwhile start a fresh
+        log. Loads replay folding logs only while the patterns file keeps that
+        inode: once the compacted file replaces it they are ignored, so a
+        crash before they are deleted cannot apply their deltas twice.
+
+        Args:
+            patterns: Patterns with every delta replayed, from _load_patterns
+            signature: State token _load_patterns returned with them
+
+        Returns:
+            State token for the compacted store, or one that matches no state
+            when the store changed since the load and compaction was skipped
+        """
+        file_signature, delta_signature = signature
+        if file_signature is None or _file_signature(self.patterns_file) != file_signature:
+            return (None, None)  # Records appended since the load would be lost
+
+        inode = file_signature[0]
+        folding_files = self._folding_files(inode)
+        for stale in set(self._folding_files()) - set(folding_files):
+            stale.unlink(missing_ok=True)  # Left by a crash after its compaction replaced the file
+
+        if delta_signature is not None:
+            folding_file = self._folding_file(inode, len(folding_files))
+            try:
+                os.replace(self.delta_file, folding_file)
+            except FileNotFoundError:
+                return (None, None)  # Another store compacted first
+            if _file_signature(folding_file) != delta_signature:
+                return (None, None)  # Outcomes landed after the load; fold them next time
+            folding_files.append(folding_file)
+
+        tmp_file = self.patterns_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(b"".join(_dump_pattern(pattern) for pattern in patterns.values()))
+        compacted_signature = _file_signature(tmp_file)
+
+        tmp_file.replace(self.patterns_file)
+        for folding_file in folding_files:
+            folding_file.unlink(missing_ok=True)
+        return (compacted_signature, None)
+
+    def _folding_file(self: "LearningStore", inode: int, sequence: int) -> Path:
+        """Return the path a compaction of the patterns file with inode renames its delta log to."""
+        return self.patterns_file.with_name(f"{self.patterns_file.stem}.folding-{inode}-{sequence}.jsonl")
+
+    def _folding_files(self: "LearningStore", inode: int | None = None) -> list[Path]:
+        """Return folding logs for the patterns file with inode (any inode if None), oldest first."""
+        prefix = f"{self.patterns_file.stem}.folding-{'' if inode is None else f'{inode}-'}"
+        paths = self.patterns_file.parent.glob(f"{prefix}*.jsonl")
+        return sorted(paths, key=lambda path: [int(part) for part in path.stem.rsplit("-", 2)[1:]])
+
+
+def _build_pattern(
+    issue_pattern: str, recommendation: str, citations: list[Citation], outcome: str | None
+) -> dict[str, Any]:
+    """Build a new pattern record ready to append to the patterns file."""
+    # Generate pattern ID
+    timestamp = datetime.utcnow().isoformat()
+    pattern_id = f"P-{hashlib.md5(f'{timestamp}{issue_pattern}'.encode()).hexdigest()[:8]}"
+
+    return {
+        "pattern_id": pattern_id,
+        "issue_pattern": issue_pattern,
+        "recommendation": recommendation,
+        "citations": [
+            {
+                "source_type": c.source_type,
+                "source_id": c.source_id,
+                "source_url": c.source_url,
+                "excerpt": c.excerpt,
+                "retrieved_at": c.retrieved_at,
+            }
+            for c in citations
+        ],
+        "outcome": outcome,
+        "successful_resolutions": 1 if outcome == "resolved" else 0,
+        "total_uses": 1,
+        "created_at": timestamp,
+        "updated_at": timestamp,
+    }
+
+
+def _file_signature(path: Path) -> tuple[int, int, int] | None:
+    """Return (inode, size, mtime_ns) for path, or None if it doesn't exist.
+
+    Inode catches compaction's atomic rename; size catches appends that land
+    within the filesystem's mtime granularity.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _append(path: Path, data: bytes) -> None:
+    """Append bytes to path through a raw O_APPEND descriptor.
+
+    Skips Python's buffered writer, and O_APPEND places every write at the
+    current end of file. The descriptor is opened per call rather than held,
+    since compaction replaces the patterns file by rename. If the file's last
+    line has no newline (written outside the store), one is added first so
+    the appended record starts its own line.
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        size = os.fstat(fd).st_size
+        if size and os.pread(fd, 1, size - 1) != b"\n":
+            data = b"\n" + data  # Terminate a last line written without one
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def _read_jsonl(path: Path) -> tuple[list[dict[str, Any]], tuple[int, int, int]]:
+    """Decode JSONL records from path.
+
+    Reads one line at a time from a binary buffered reader and hands the raw
+    bytes to orjson. A final line without a newline is kept when it decodes
+    (a file written or edited outside the store); otherwise it is a write
+    still in progress and is left for the next read.
+
+    Returns:
+        Tuple of (records, (inode, offset consumed, mtime_ns)). The signature
+        comes from the open descriptor, so it describes exactly the bytes
+        decoded even if the file grows while it is read.
+    """
+    records = []
+    offset = 0
+    with open(path, "rb", buffering=READ_BUFFER_SIZE) as f:
+        while (line := f.readline()).endswith(b"\n"):
+            offset += len(line)
+            if line.strip():
+                records.append(orjson.loads(line))
+        if line.strip():
+            try:
+                records.append(orjson.loads(line))
+                offset += len(line)
+            except orjson.JSONDecodeError:
+                pass  # Caught a write mid-line
+        stat = os.fstat(f.fileno())
+    return records, (stat.st_ino, offset, stat.st_mtime_ns)
+
+
+def _read_jsonl_if_exists(path: Path) -> tuple[list[dict[str, Any]], tuple[int, int, int] | None]:
+    """Read all complete JSONL records from path, or nothing if it is missing."""
+    try:
+        return _read_jsonl(path)
+    except FileNotFoundError:
+        return [], None
+
+
+def _scan(patterns: list[dict[str, Any]], query: str, min_confidence: float) -> list[dict[str, Any]]:
+    """Return patterns whose issue text contains, or is contained in, query.
+
+    Matching is case-insensitive. Results are ordered by confidence, highest
+    first, with ties kept in file order.
+    """
+    query = query.lower()
+    matches = []
+    for pattern in patterns:
+        if pattern["confidence"] >= min_confidence:
+            text = pattern["issue_pattern"].lower()
+            if query in text or text in query:
+                matches.append(pattern)
+    matches.sort(key=lambda pattern: pattern["confidence"], reverse=True)
+    return matches
+
+
+def _apply_outcome(pattern: dict[str, Any], delta: dict[str, Any]) -> None:
+    """Apply a single outcome delta to a pattern record in place."""
+    pattern["outcome"] = delta["outcome"]
+    pattern["total_uses"] += 1
+
+    if delta["outcome"] == "resolved":
+        pattern["successful_resolutions"] += 1
+
+    pattern["confidence"] = _confidence(pattern)
+    pattern["updated_at"] = delta["updated_at"]
+
+
+def _confidence(pattern: dict[str, Any]) -> float:
+    """Derive confidence as successful_resolutions / total_uses.
+
+    A pattern recorded without a resolution and never updated starts at 0.5.
+    """
+    successes = pattern["successful_resolutions"]
+    uses = pattern["total_uses"]
+    if successes or uses > 1:
+        return successes / uses
+    return 0.5
+
+
+def _dump_pattern(pattern: dict[str, Any]) -> bytes:
+    """Serialize a pattern as one JSONL line, leaving out derived confidence."""
+    return orjson.dumps({key: value for key, value in pattern.items() if key != "confidence"}) + b"\n"
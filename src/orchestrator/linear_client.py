@@ -8,7 +8,10 @@ import logging
 import os
 from typing import Any
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 from orchestrator.config import get_linear_writes_enabled
 
@@ -16,9 +19,72 @@ logger = logging.getLogger(__name__)
 
 LINEAR_API_ENDPOINT = "https://api.linear.app/graphql"
 
+_FETCH_ISSUE_QUERY = """
+query GetIssue($id: String!) {
+    issue(id: $id) {
+        id
+        title
+        description
+        priority
+        state {
+            name
+        }
+        team {
+            key
+        }
+    }
+}
+"""
+
+# Sent as two requests so a failed priority update never posts the comment
+_UPDATE_PRIORITY_MUTATION = """
+mutation UpdateIssuePriority($id: String!, $priority: Int!) {
+    issueUpdate(id: $id, input: { priority: $priority }) {
+        success
+        issue {
+            id
+            priority
+        }
+    }
+}
+"""
+
+_ADD_COMMENT_MUTATION = """
+mutation AddComment($issueId: String!, $body: String!) {
+    commentCreate(input: { issueId: $issueId, body: $body }) {
+        success
+        comment {
+            id
+        }
+    }
+}
+"""
+
+
+def _build_session() -> requests.Session:
+    """Build pooled HTTP session reused across Linear API calls.
+
+    Keeps TCP/TLS connections to Linear alive between requests. Only failures
+    to connect are retried; every GraphQL call is a POST, which urllib3 never
+    replays on an error status (429/5xx) or a failed read, so a request that
+    reached Linear is not sent twice.
+
+    Returns:
+        Session with retrying connection pool mounted for https://
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.1)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+    return session
+
+
+_SESSION = _build_session()
+
+_API_KEY: str | None = None  # Resolved on first request; see _reset_api_key()
+
 
 def _get_api_key() -> str:
-    """Get Linear API key from environment.
+    """Get Linear API key from environment, cached after the first successful lookup.
 
     Returns:
         LINEAR_API_KEY from environment
@@ -26,12 +92,21 @@ def _get_api_key() -> str:
     Raises:
         RuntimeError: If LINEAR_API_KEY not set
     """
-    api_key = os.environ.get("LINEAR_API_KEY")
-    if not api_key:
-        raise RuntimeError(
-            "LINEAR_API_KEY environment variable not set. Get your API key from https://linear.app/settings/api"
-        )
-    return api_key
+    global _API_KEY
+    if _API_KEY is None:
+        api_key = os.environ.get("LINEAR_API_KEY")
+        if not api_key:
+            raise RuntimeError(
+                "LINEAR_API_KEY environment variable not set. Get your API key from https://linear.app/settings/api"
+            )
+        _API_KEY = api_key
+    return _API_KEY
+
+
+def _reset_api_key() -> None:
+    """Forget the cached API key so the next request re-reads the environment."""
+    global _API_KEY
+    _API_KEY = None
 
 
 def _make_graphql_request(query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
@@ -59,12 +134,13 @@ def _make_graphql_request(query: str, variables: dict[str, Any] | None = None) -
         payload["variables"] = variables
 
     try:
-        response = requests.post(LINEAR_API_ENDPOINT, json=payload, headers=headers, timeout=30)
+        response = _SESSION.post(LINEAR_API_ENDPOINT, json=payload, headers=headers, timeout=30)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"Linear API request failed: {e}") from e
 
-    data = response.json()
+    # Decode raw bytes directly; skips requests' text decoding and charset sniffing
+    data = orjson.loads(response.content)
 
     # Check for GraphQL errors
     if "errors" in data:
@@ -93,26 +169,9 @@ def fetch_issue(issue_id: str) -> dict[str, Any]:
     Raises:
         RuntimeError: If API request fails or issue not found
     """
-    query = """
-    query GetIssue($id: String!) {
-        issue(id: $id) {
-            id
-            title
-            description
-            priority
-            state {
-                name
-            }
-            team {
-                key
-            }
-        }
-    }
-    """
-
     logger.info(f"Fetching issue {issue_id} from Linear API")
 
-    data = _make_graphql_request(query, {"id": issue_id})
+    data = _make_graphql_request(_FETCH_ISSUE_QUERY, {"id": issue_id})
 
     if not data.get("issue"):
         raise RuntimeError(f"Issue {issue_id} not found")
@@ -126,6 +185,9 @@ def update_issue(issue_id: str, priority: int, comment: str) -> None:
     If LINEAR_ENABLE_WRITES is disabled, logs what would have been
     written but does not make API calls.
 
+    The comment is only posted once the priority update succeeds, so a
+    failed update can be retried without duplicating the comment.
+
     Args:
         issue_id: Linear issue ID
         priority: Priority level (0=none, 1=urgent, 2=high, 3=medium, 4=low)
@@ -140,41 +202,16 @@ def update_issue(issue_id: str, priority: int, comment: str) -> None:
         )
         return
 
-    # First, update priority
-    update_mutation = """
-    mutation UpdateIssuePriority($id: String!, $priority: Int!) {
-        issueUpdate(id: $id, input: { priority: $priority }) {
-            success
-            issue {
-                id
-                priority
-            }
-        }
-    }
-    """
-
     logger.info(f"Updating issue {issue_id} priority to {priority}")
 
-    update_data = _make_graphql_request(update_mutation, {"id": issue_id, "priority": priority})
+    update_data = _make_graphql_request(_UPDATE_PRIORITY_MUTATION, {"id": issue_id, "priority": priority})
 
     if not update_data.get("issueUpdate", {}).get("success"):
         raise RuntimeError(f"Failed to update issue {issue_id} priority")
 
-    # Then, add comment
-    comment_mutation = """
-    mutation AddComment($issueId: String!, $body: String!) {
-        commentCreate(input: { issueId: $issueId, body: $body }) {
-            success
-            comment {
-                id
-            }
-        }
-    }
-    """
-
     logger.info(f"Adding comment to issue {issue_id}")
 
-    comment_data = _make_graphql_request(comment_mutation, {"issueId": issue_id, "body": comment})
+    comment_data = _make_graphql_request(_ADD_COMMENT_MUTATION, {"issueId": issue_id, "body": comment})
 
     if not comment_data.get("commentCreate", {}).get("success"):
         raise RuntimeError(f"Failed to add comment to issue {issue_id}")
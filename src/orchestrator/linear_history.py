@@ -1,5 +1,6 @@
 """Linear issue history research for investigation workflow."""
 
+from collections.abc import Mapping, Sequence
 from typing import Any
 
 from orchestrator.linear_client import fetch_issue
@@ -87,7 +88,7 @@ class LinearHistoryResearcher:
             excerpt=excerpt[:200],  # Truncate to 200 chars for readability
         )
 
-    def find_resolution_patterns(self, similar_issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def find_resolution_patterns(self, similar_issues: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
         """Identify common resolution patterns from similar issues.
 
         Args:
@@ -121,7 +122,7 @@ class LinearHistoryResearcher:
         result.sort(key=lambda p: int(p["count"]), reverse=True)
         return result
 
-    def find_team_expertise(self, similar_issues: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def find_team_expertise(self, similar_issues: Sequence[Mapping[str, Any]]) -> list[dict[str, Any]]:
         """Identify team members with expertise in similar issues.
 
         Args:
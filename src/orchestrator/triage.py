@@ -57,7 +57,7 @@ def execute_triage(ticket_id: str) -> TriageResult:
     Returns:
         TriageResult with all analysis data and execution metadata
     """
-    start_time = time.time()
+    start_time = time.monotonic()
 
     try:
         # Show write mode
@@ -105,7 +105,7 @@ def execute_triage(ticket_id: str) -> TriageResult:
         priority_level = severity_to_priority(severity.severity)
         update_issue(ticket_id, priority_level, comment)
 
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         logger.info(f"✓ Triage complete for {ticket_id} ({duration:.1f}s total)")
 
         # Confirm what happened with Linear
@@ -126,7 +126,7 @@ def execute_triage(ticket_id: str) -> TriageResult:
         )
 
     except Exception as e:
-        duration = time.time() - start_time
+        duration = time.monotonic() - start_time
         logger.error(f"Triage failed: {e}")
         # Return failure result instead of raising
         return TriageResult(
@@ -17,6 +17,22 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# Compiled once at import; parse_llm_json runs on every agent response
+_MARKDOWN_BLOCK_PATTERNS = (
+    re.compile(r"```json\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE),  # ```json ... ```
+    re.compile(r"```\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE),  # ``` ... ```
+)
+
+# Plausible start of a bare JSON object/array (opener followed by a token that can
+# begin its contents); raw_decode finds where it ends. Filtering prose like
+# "{see logs}" here avoids a raised JSONDecodeError per stray bracket.
+# Objects are tried before arrays, so callers expecting a dict get one when present.
+_JSON_STARTS = (
+    re.compile(r'\{\s*["}]'),  # Objects
+    re.compile(r'\[\s*[-"\d\[\]{tfn]'),  # Arrays
+)
+_JSON_DECODER = json.JSONDecoder()
+
 
 def parse_llm_json(response: str) -> dict[str, Any]:
     """Extract JSON from LLM response with defensive parsing.
@@ -46,40 +62,47 @@ def parse_llm_json(response: str) -> dict[str, Any]:
         pass
 
     # Extract from markdown code blocks
-    markdown_patterns = [
-        r"```json\s*(.*?)\s*```",  # ```json ... ```
-        r"```\s*(.*?)\s*```",  # ``` ... ```
-    ]
-
-    for pattern in markdown_patterns:
-        matches = re.findall(pattern, response, re.DOTALL | re.IGNORECASE)
+    for pattern in _MARKDOWN_BLOCK_PATTERNS:
+        matches = pattern.findall(response)
         for match in matches:
             try:
                 return json.loads(match.strip())
             except json.JSONDecodeError:
                 continue
 
-    # Find JSON object boundaries - use non-greedy matching to avoid
-    # capturing multiple objects with invalid text between them
-    json_patterns = [
-        r"\{(?:[^{}]|(?:\{[^{}]*\}))*\}",  # Nested objects (max 2 levels)
-        r"\[(?:[^\[\]]|(?:\[[^\[\]]*\]))*\]",  # Nested arrays (max 2 levels)
-    ]
-
-    for pattern in json_patterns:
-        matches = re.findall(pattern, response, re.DOTALL)
-        # Try each match, longest first
-        for match in sorted(matches, key=len, reverse=True):
-            try:
-                return json.loads(match)
-            except json.JSONDecodeError:
-                continue
+    # Find bare JSON in surrounding text: the longest object, else the longest array
+    for start_pattern in _JSON_STARTS:
+        value = _longest_json(response, start_pattern)
+        if value is not None:
+            return value
 
     # If all parsing attempts fail, raise with helpful context
     preview = response[:200] + ("..." if len(response) > 200 else "")
     raise ValueError(f"Could not extract valid JSON from LLM response. Preview: {preview}")
 
 
+def _longest_json(response: str, start_pattern: re.Pattern[str]) -> Any:
+    """Return the longest JSON value starting at a start_pattern match, or None.
+
+    Scans left to right once. A successful decode skips past its whole span, so
+    nested values and text between separate values are never combined.
+    """
+    best: Any = None
+    best_length = 0
+    match = start_pattern.search(response)
+    while match:
+        start = match.start()
+        try:
+            value, end = _JSON_DECODER.raw_decode(response, start)
+        except json.JSONDecodeError:
+            match = start_pattern.search(response, start + 1)
+            continue
+        if end - start > best_length:
+            best, best_length = value, end - start
+        match = start_pattern.search(response, end)
+    return best
+
+
 def run_cli_command(
     command: list[str],
     timeout: int = 300,
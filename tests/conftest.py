@@ -1,9 +1,34 @@
 """Pytest fixtures for orchestrator tests."""
 
 import os
+import subprocess
+from collections.abc import Callable
+from types import SimpleNamespace
 
+import orjson
 import pytest
 
+from orchestrator import linear_client, utils
+from orchestrator.models import SeverityAnalysis, ValidityAnalysis
+
+
+def _blocked(what: str) -> Callable[..., None]:
+    def _raise(*args, **kwargs) -> None:
+        raise RuntimeError(f"Unpatched {what} in test; mock it explicitly")
+
+    return _raise
+
+
+# subprocess as seen by orchestrator.utils, with run() refusing to spawn anything
+_GUARDED_SUBPROCESS = SimpleNamespace(**{**vars(subprocess), "run": _blocked("subprocess.run")})
+
+
+@pytest.fixture(autouse=True)
+def _no_external_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Fail fast instead of hitting the Linear API or spawning CLI tools when a patch is missing."""
+    monkeypatch.setattr(linear_client._SESSION, "post", _blocked("Linear API call"))
+    monkeypatch.setattr(utils, "subprocess", _GUARDED_SUBPROCESS)
+
 
 @pytest.fixture
 def ticket_json() -> dict:
@@ -40,6 +65,83 @@ def severity_analysis() -> dict:
     }
 
 
+# Shared analysis models: built once per session since tests only read them
+@pytest.fixture(scope="session")
+def validity_clear() -> ValidityAnalysis:
+    """Valid, actionable ticket."""
+    return ValidityAnalysis(
+        is_valid=True,
+        is_actionable=True,
+        missing_context=[],
+        reasoning="Clear bug report with reproduction steps",
+    )
+
+
+@pytest.fixture(scope="session")
+def validity_missing_context() -> ValidityAnalysis:
+    """Valid ticket that is not actionable until context is added."""
+    return ValidityAnalysis(
+        is_valid=True,
+        is_actionable=False,
+        missing_context=["Error logs", "Browser version"],
+        reasoning="Need additional information",
+    )
+
+
+@pytest.fixture(scope="session")
+def validity_invalid() -> ValidityAnalysis:
+    """Invalid, non-actionable ticket."""
+    return ValidityAnalysis(
+        is_valid=False,
+        is_actionable=False,
+        missing_context=[],
+        reasoning="Not a bug, user error",
+    )
+
+
+@pytest.fixture(scope="session")
+def severity_p1() -> SeverityAnalysis:
+    """High-severity assessment needing backend expertise."""
+    return SeverityAnalysis(
+        severity="P1",
+        complexity="medium",
+        required_expertise=["Backend", "Database"],
+        reasoning="Critical data loss issue",
+    )
+
+
+@pytest.fixture(scope="session")
+def severity_p2() -> SeverityAnalysis:
+    """Medium-severity assessment with no required expertise."""
+    return SeverityAnalysis(
+        severity="P2",
+        complexity="simple",
+        required_expertise=[],
+        reasoning="OK",
+    )
+
+
+@pytest.fixture(scope="session")
+def severity_p3() -> SeverityAnalysis:
+    """Low-severity assessment with no required expertise."""
+    return SeverityAnalysis(
+        severity="P3",
+        complexity="simple",
+        required_expertise=[],
+        reasoning="Low priority",
+    )
+
+
+@pytest.fixture
+def make_resp() -> Callable[[dict], SimpleNamespace]:
+    """Factory for lightweight Linear API response stubs (much cheaper than MagicMock)."""
+
+    def _make(payload: dict) -> SimpleNamespace:
+        return SimpleNamespace(content=orjson.dumps(payload), raise_for_status=lambda: None)
+
+    return _make
+
+
 @pytest.fixture
 def enable_linear_writes():
     """Temporarily enable Linear writes for testing."""
@@ -1,6 +1,7 @@
 """Tests for Claude Code hooks."""
 
 import json
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -19,8 +20,7 @@ class TestHookLogger:
 
         HookLogger("test_hook")  # Creates logger and log directory
 
-        assert (tmp_path / "logs").exists()
-        assert (tmp_path / "logs").is_dir()
+        assert os.path.isdir(tmp_path / "logs")
 
     def test_logger_creates_dated_log_file(self, tmp_path, monkeypatch):
         """Test that logger creates dated log file with correct naming."""
@@ -33,7 +33,7 @@ class TestHookLogger:
         logger.info("Test")  # Write to create file
 
         # Check log file exists with date format
-        assert logger.log_file.exists()
+        assert os.path.isfile(logger.log_file)
         assert "test_hook_" in logger.log_file.name
         assert logger.log_file.name.endswith(".log")
 
@@ -143,7 +143,7 @@ class TestPostTriageHook:
 
         # Check metrics file was created
         metrics_file = tmp_path / "logs" / "triage_metrics.jsonl"
-        assert metrics_file.exists()
+        assert os.path.isfile(metrics_file)
 
         # Verify content
         content = metrics_file.read_text()
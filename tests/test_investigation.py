@@ -1,15 +1,52 @@
 """Tests for investigation workflow."""
 
+import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from orchestrator.investigation import execute_investigation
-from orchestrator.models import Citation, InvestigationResult
+import pytest
+
+from orchestrator.investigation import _render_investigation_markdown, execute_investigation
+from orchestrator.models import Citation, Finding, InvestigationResult, Recommendation
+
+
+@pytest.fixture
+def investigation_result() -> InvestigationResult:
+    """Sample successful investigation result for rendering tests."""
+    citation = Citation(
+        source_type="linear_issue",
+        source_id="TEST-800",
+        source_url="https://linear.app/issue/TEST-800",
+        excerpt="Database timeout",
+    )
+    return InvestigationResult(
+        issue_id="TEST-800",
+        issue_url="https://linear.app/issue/TEST-800",
+        findings=[Finding(finding="Found 1 similar historical issues", confidence="high", citations=[citation])],
+        recommendations=[
+            Recommendation(
+                recommendation="Review similar resolved issues for solution patterns",
+                reasoning="Historical data shows this issue type has known solutions",
+                confidence="medium",
+                citations=[citation],
+            )
+        ],
+        success=True,
+        duration=0.5,
+        citations_count=2,
+    )
+
+
+@pytest.fixture
+def skip_save(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stub out writing the markdown report; rendering is tested in memory."""
+    monkeypatch.setattr("orchestrator.investigation._save_investigation", lambda *_: None)
 
 
 class TestInvestigation:
     """Test investigation workflow."""
 
+    @pytest.mark.usefixtures("skip_save")
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -18,7 +55,6 @@ class TestInvestigation:
         mock_fetch_issue,
         mock_researcher_class,
         mock_store_class,
-        tmp_path: Path,
     ) -> None:
         """Test successful investigation execution end-to-end."""
         mock_fetch_issue.return_value = {
@@ -69,7 +105,6 @@ class TestInvestigation:
     def test_execute_investigation_fetch_failure(
         self: "TestInvestigation",
         mock_fetch_issue,
-        tmp_path: Path,
     ) -> None:
         """Test investigation when fetch_issue fails."""
         mock_fetch_issue.side_effect = RuntimeError("API error")
@@ -81,6 +116,7 @@ class TestInvestigation:
         assert result.error is not None
         assert "API error" in result.error
 
+    @pytest.mark.usefixtures("skip_save")
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -89,7 +125,6 @@ class TestInvestigation:
         mock_fetch_issue,
         mock_researcher_class,
         mock_store_class,
-        tmp_path: Path,
     ) -> None:
         """Test investigation when LinearHistoryResearcher fails."""
         mock_fetch_issue.return_value = {
@@ -110,6 +145,7 @@ class TestInvestigation:
         assert result.error is not None
         assert "Research failed" in result.error
 
+    @pytest.mark.integration
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -119,8 +155,10 @@ class TestInvestigation:
         mock_researcher_class,
         mock_store_class,
         tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        """Test that investigation creates markdown output file."""
+        """Test that investigation persists rendered markdown to output file."""
+        monkeypatch.chdir(tmp_path)
         mock_fetch_issue.return_value = {
             "id": "TEST-300",
             "title": "Test issue",
@@ -143,12 +181,24 @@ class TestInvestigation:
         assert result.success is True
 
         output_file = Path("investigation_results") / "TEST-300.md"
-        assert output_file.exists()
+        assert os.path.isfile(output_file)
+        assert output_file.read_text() == _render_investigation_markdown(result)
+
+    def test_render_markdown(self: "TestInvestigation", investigation_result: InvestigationResult) -> None:
+        """Test markdown rendering contains expected sections."""
+        content = _render_investigation_markdown(investigation_result)
 
-        content = output_file.read_text()
-        assert "# Investigation: TEST-300" in content
-        assert "Test issue" in content
+        assert "## Investigation: TEST-800" in content
+        assert "**Issue**: [TEST-800](https://linear.app/issue/TEST-800)" in content
+        assert "### Findings" in content
+        assert "Found 1 similar historical issues" in content
+        assert "### Recommendations" in content
+        assert "Review similar resolved issues for solution patterns" in content
+        assert "Database timeout" in content
+        assert "*No pattern matches found*" in content
+        assert "Citations: 2 | Patterns: 0*" in content
 
+    @pytest.mark.usefixtures("skip_save")
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -157,7 +207,6 @@ class TestInvestigation:
         mock_fetch_issue,
         mock_researcher_class,
         mock_store_class,
-        tmp_path: Path,
     ) -> None:
         """Test investigation with multiple similar issues found."""
         mock_fetch_issue.return_value = {
@@ -201,6 +250,7 @@ class TestInvestigation:
         assert len(result.findings) > 0
         assert result.similar_issues_count == 2  # Similar issues were found
 
+    @pytest.mark.usefixtures("skip_save")
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -209,7 +259,6 @@ class TestInvestigation:
         mock_fetch_issue,
         mock_researcher_class,
         mock_store_class,
-        tmp_path: Path,
     ) -> None:
         """Test investigation with resolution patterns found."""
         mock_fetch_issue.return_value = {
@@ -238,6 +287,7 @@ class TestInvestigation:
         # Now returns actual recommendations (no patterns, so basic recommendation)
         assert len(result.recommendations) > 0
 
+    @pytest.mark.usefixtures("skip_save")
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -246,7 +296,6 @@ class TestInvestigation:
         mock_fetch_issue,
         mock_researcher_class,
         mock_store_class,
-        tmp_path: Path,
     ) -> None:
         """Test that _synthesize_findings returns basic finding when no historical data."""
         mock_fetch_issue.return_value = {
@@ -272,6 +321,7 @@ class TestInvestigation:
         assert len(result.findings) == 1
         assert "No similar historical issues found" in result.findings[0].finding
 
+    @pytest.mark.usefixtures("skip_save")
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -280,7 +330,6 @@ class TestInvestigation:
         mock_fetch_issue,
         mock_researcher_class,
         mock_store_class,
-        tmp_path: Path,
     ) -> None:
         """Test that _generate_recommendations returns basic recommendation without historical data."""
         mock_fetch_issue.return_value = {
@@ -306,58 +355,7 @@ class TestInvestigation:
         assert len(result.recommendations) == 1
         assert "Conduct detailed technical investigation" in result.recommendations[0].recommendation
 
-    @patch("orchestrator.investigation.LearningStore")
-    @patch("orchestrator.investigation.LinearHistoryResearcher")
-    @patch("orchestrator.investigation.fetch_issue")
-    def test_execute_investigation_markdown_content(
-        self: "TestInvestigation",
-        mock_fetch_issue,
-        mock_researcher_class,
-        mock_store_class,
-        tmp_path: Path,
-    ) -> None:
-        """Test markdown file contains expected sections."""
-        mock_fetch_issue.return_value = {
-            "id": "TEST-800",
-            "title": "Database timeout",
-            "description": "Connection fails after 30s",
-            "state": {"name": "in_progress"},
-        }
-
-        mock_researcher = MagicMock()
-        mock_researcher.find_similar_issues.return_value = [
-            {
-                "id": "TEST-800",
-                "title": "Database timeout",
-                "description": "Connection fails",
-                "url": "https://linear.app/issue/TEST-800",
-                "state": "in_progress",
-                "labels": "bug",
-            }
-        ]
-        mock_researcher.find_resolution_patterns.return_value = [
-            {"pattern": "Increase timeout", "count": 3, "example_issue_id": "TEST-750"}
-        ]
-        mock_researcher.find_team_expertise.return_value = []
-        mock_researcher_class.return_value = mock_researcher
-
-        mock_store = MagicMock()
-        mock_store.find_matching_patterns.return_value = []
-        mock_store_class.return_value = mock_store
-
-        result = execute_investigation("TEST-800")
-
-        assert result.success is True
-
-        output_file = Path("investigation_results") / "TEST-800.md"
-        content = output_file.read_text()
-
-        # Check for generated content sections
-        assert "TEST-800" in content
-        assert "### Findings" in content
-        assert "### Recommendations" in content
-        assert "Database timeout" in content
-
+    @pytest.mark.usefixtures("skip_save")
     @patch("orchestrator.investigation.LearningStore")
     @patch("orchestrator.investigation.LinearHistoryResearcher")
     @patch("orchestrator.investigation.fetch_issue")
@@ -366,7 +364,6 @@ class TestInvestigation:
         mock_fetch_issue,
         mock_researcher_class,
         mock_store_class,
-        tmp_path: Path,
     ) -> None:
         """Test that InvestigationResult passes Pydantic validation."""
         mock_fetch_issue.return_value = {
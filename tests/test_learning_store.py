@@ -1,403 +1,479 @@
 """Tests for pattern learning and matching."""
 
-import json
 from pathlib import Path
+from unittest.mock import patch
 
-from orchestrator.learning_store import LearningStore
+import orjson
+import pytest
+
+from orchestrator.learning_store import LearningStore, _scan
 from orchestrator.models import Citation
 
 
+def _citation(source_id: str) -> Citation:
+    """Build a citation for recorded test patterns."""
+    return Citation(
+        source_type="linear_issue",
+        source_id=source_id,
+        source_url=f"https://linear.app/issue/{source_id}",
+        excerpt="Test citation",
+    )
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> LearningStore:
+    """Empty learning store backed by a temporary patterns file."""
+    return LearningStore(patterns_file=str(tmp_path / "patterns.jsonl"))
+
+
+@pytest.fixture(scope="module")
+def populated_store(tmp_path_factory: pytest.TempPathFactory) -> LearningStore:
+    """Learning store with one file of patterns shared by read-only tests."""
+    store = LearningStore(patterns_file=str(tmp_path_factory.mktemp("learning") / "patterns.jsonl"))
+    store.record_patterns(
+        [
+            {
+                "issue_pattern": "database connection timeout",
+                "recommendation": "Increase pool size",
+                "citations": [_citation("ABC-300")],
+                "outcome": "resolved",
+            },
+            {
+                "issue_pattern": "service crashes randomly",
+                "recommendation": "Add error handling",
+                "citations": [_citation("ABC-400")],
+                "outcome": "resolved",
+            },
+            {
+                "issue_pattern": "unknown error occurs",
+                "recommendation": "Check logs",
+                "citations": [_citation("P-1")],
+            },
+            {"issue_pattern": "error type A", "recommendation": "Fix A", "citations": [_citation("P-X")]},
+            {
+                "issue_pattern": "error type A occurs",
+                "recommendation": "Fix B",
+                "citations": [_citation("P-X")],
+                "outcome": "resolved",
+            },
+            {
+                "issue_pattern": "documented pattern with citations",
+                "recommendation": "follow documented fix",
+                "citations": [
+                    _citation("ABC-600"),
+                    Citation(
+                        source_type="git_commit",
+                        source_id="def456",
+                        source_url="https://github.com/repo/commit/def456",
+                        excerpt="Fix commit",
+                    ),
+                ],
+                "outcome": "resolved",
+            },
+        ]
+    )
+    return store
+
+
 class TestLearningStore:
     """Test LearningStore class."""
 
     def test_init_creates_data_directory(self: "TestLearningStore", tmp_path: Path) -> None:
         """Test that LearningStore creates data directory on init."""
-        patterns_file = tmp_path / "patterns.jsonl"
+        patterns_file = tmp_path / "data" / "patterns.jsonl"
 
         store = LearningStore(patterns_file=str(patterns_file))
 
         assert patterns_file.parent.exists()
         assert store.patterns_file == patterns_file
 
-    def test_record_pattern_creates_file(self: "TestLearningStore", tmp_path: Path) -> None:
+    def test_record_pattern_creates_file(self: "TestLearningStore", store: LearningStore) -> None:
         """Test that record_pattern creates JSONL file."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        citations = [
-            Citation(
-                source_type="linear_issue",
-                source_id="ABC-100",
-                source_url="https://linear.app/issue/ABC-100",
-                excerpt="Similar issue",
-            )
-        ]
-
         pattern_id = store.record_pattern(
             issue_pattern="Database timeout errors",
             recommendation="Increase connection pool",
-            citations=citations,
+            citations=[_citation("ABC-100")],
             outcome=None,
         )
 
-        assert patterns_file.exists()
+        assert store.patterns_file.exists()
         assert pattern_id.startswith("P-")
 
-    def test_record_pattern_writes_jsonl_format(self: "TestLearningStore", tmp_path: Path) -> None:
+    @pytest.mark.parametrize(
+        ("outcome", "successes", "confidence"),
+        [
+            (None, 0, 0.5),  # Unresolved starts at 0.5
+            ("resolved", 1, 1.0),  # Resolved on first use = 100% confidence
+        ],
+    )
+    def test_record_pattern_writes_jsonl_format(
+        self: "TestLearningStore", store: LearningStore, outcome: str | None, successes: int, confidence: float
+    ) -> None:
         """Test that record_pattern writes proper JSONL format."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        citations = [
-            Citation(
-                source_type="linear_issue",
-                source_id="ABC-200",
-                source_url="https://linear.app/issue/ABC-200",
-                excerpt="Test citation",
-            )
-        ]
-
         pattern_id = store.record_pattern(
             issue_pattern="Memory leak in service",
             recommendation="Restart service daily",
-            citations=citations,
-            outcome=None,
+            citations=[_citation("ABC-200")],
+            outcome=outcome,
         )
 
         # Read and parse JSONL
-        with open(patterns_file) as f:
-            line = f.readline()
-            pattern = json.loads(line)
+        with open(store.patterns_file, "rb") as f:
+            pattern = orjson.loads(f.readline())
 
         assert pattern["pattern_id"] == pattern_id
         assert pattern["issue_pattern"] == "Memory leak in service"
         assert pattern["recommendation"] == "Restart service daily"
         assert len(pattern["citations"]) == 1
-        assert pattern["outcome"] is None
-        assert pattern["successful_resolutions"] == 0
+        assert pattern["outcome"] == outcome
+        assert pattern["successful_resolutions"] == successes
         assert pattern["total_uses"] == 1
-        assert pattern["confidence"] == 0.5  # Unresolved starts at 0.5
+        assert "confidence" not in pattern  # Derived from counts on load
 
-    def test_record_pattern_with_resolved_outcome(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test recording a pattern that was immediately resolved."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        store.record_pattern(
-            issue_pattern="CPU spike",
-            recommendation="Kill rogue process",
-            citations=[
-                Citation(
-                    source_type="logs",
-                    source_id="log-123",
-                    source_url="https://logs/123",
-                    excerpt="Process X using 100% CPU",
-                )
-            ],
-            outcome="resolved",
-        )
-
-        with open(patterns_file) as f:
-            pattern = json.loads(f.readline())
-
-        assert pattern["outcome"] == "resolved"
-        assert pattern["successful_resolutions"] == 1
-        assert pattern["total_uses"] == 1
-        assert pattern["confidence"] == 1.0  # Resolved on first use = 100% confidence
+        loaded = store._load_pattern(pattern_id)
+        assert loaded is not None
+        assert loaded["confidence"] == confidence
 
-    def test_find_matching_patterns_empty_file(self: "TestLearningStore", tmp_path: Path) -> None:
+    def test_find_matching_patterns_empty_file(self: "TestLearningStore", store: LearningStore) -> None:
         """Test finding patterns when file doesn't exist."""
-        patterns_file = tmp_path / "nonexistent.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
         matches = store.find_matching_patterns("database timeout", min_confidence=0.7)
 
         assert len(matches) == 0
 
-    def test_find_matching_patterns_exact_match(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test finding patterns with exact text match."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        # Record a pattern
-        citations = [
-            Citation(
-                source_type="linear_issue",
-                source_id="ABC-300",
-                source_url="https://linear.app/issue/ABC-300",
-                excerpt="Fixed timeout",
-            )
-        ]
-        store.record_pattern(
-            issue_pattern="database connection timeout",
-            recommendation="Increase pool size",
-            citations=citations,
-            outcome="resolved",
-        )
-
-        # Search for exact match
-        matches = store.find_matching_patterns("database connection timeout", min_confidence=0.7)
-
-        assert len(matches) == 1
-        assert matches[0].description == "database connection timeout"
-        assert matches[0].confidence == 1.0
-
-    def test_find_matching_patterns_substring_match(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test finding patterns with substring matching."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        citations = [
-            Citation(
-                source_type="linear_issue",
-                source_id="ABC-400",
-                source_url="https://linear.app/issue/ABC-400",
-                excerpt="Example",
-            )
-        ]
-        store.record_pattern(
-            issue_pattern="service crashes randomly",
-            recommendation="Add error handling",
-            citations=citations,
-            outcome="resolved",
-        )
-
-        # Search with substring
-        matches = store.find_matching_patterns("service crashes", min_confidence=0.7)
+    @pytest.mark.parametrize(
+        ("query", "min_confidence", "expected"),
+        [
+            # Exact text match
+            ("database connection timeout", 0.7, [("database connection timeout", 1.0)]),
+            # Substring match
+            ("service crashes", 0.7, [("service crashes randomly", 1.0)]),
+            # Unresolved pattern (confidence 0.5) filtered by threshold
+            ("unknown error occurs", 0.7, []),
+            # Higher confidence first
+            ("error type A", 0.3, [("error type A occurs", 1.0), ("error type A", 0.5)]),
+        ],
+    )
+    def test_find_matching_patterns(
+        self: "TestLearningStore",
+        populated_store: LearningStore,
+        query: str,
+        min_confidence: float,
+        expected: list[tuple[str, float]],
+    ) -> None:
+        """Test matching, confidence filtering, and ordering of found patterns."""
+        matches = populated_store.find_matching_patterns(query, min_confidence=min_confidence)
+
+        assert [(m.description, m.confidence) for m in matches] == expected
+
+    def test_find_matching_patterns_with_citations(self: "TestLearningStore", populated_store: LearningStore) -> None:
+        """Test that found patterns include their citations."""
+        matches = populated_store.find_matching_patterns("documented pattern", min_confidence=0.7)
 
         assert len(matches) == 1
-        assert "crashes" in matches[0].description
-
-    def test_find_matching_patterns_filters_low_confidence(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test that low-confidence patterns are filtered out."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        citations = [
-            Citation(
-                source_type="pattern",
-                source_id="P-1",
-                source_url="https://internal/P-1",
-                excerpt="Test",
-            )
-        ]
-
-        # Record unresolved pattern (confidence 0.5)
-        store.record_pattern(
-            issue_pattern="unknown error occurs",
-            recommendation="Check logs",
-            citations=citations,
-            outcome=None,
-        )
-
-        # Search with high confidence threshold
-        matches = store.find_matching_patterns("unknown error occurs", min_confidence=0.7)
-
-        assert len(matches) == 0  # 0.5 < 0.7, should be filtered
-
-    def test_find_matching_patterns_sorts_by_confidence(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test that results are sorted by confidence descending."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        citations = [
-            Citation(
-                source_type="pattern",
-                source_id="P-X",
-                source_url="https://internal/P-X",
-                excerpt="Test",
-            )
-        ]
-
-        # Record pattern with low confidence
-        store.record_pattern(
-            issue_pattern="error type A",
-            recommendation="Fix A",
-            citations=citations,
-            outcome=None,  # confidence = 0.5
-        )
-
-        # Record pattern with high confidence
-        store.record_pattern(
-            issue_pattern="error type A occurs",
-            recommendation="Fix B",
-            citations=citations,
-            outcome="resolved",  # confidence = 1.0
-        )
-
-        matches = store.find_matching_patterns("error type A", min_confidence=0.3)
-
-        assert len(matches) == 2
-        assert matches[0].confidence == 1.0  # Higher confidence first
-        assert matches[1].confidence == 0.5
-
-    def test_update_outcome_pattern_not_found(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test updating outcome when pattern doesn't exist."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
+        assert len(matches[0].citations) == 2
+        assert matches[0].citations[0].source_id == "ABC-600"
+        assert matches[0].citations[1].source_id == "def456"
 
+    def test_update_outcome_without_patterns_file(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that updating an empty store reports nothing was recorded."""
         updated = store.update_outcome("P-nonexistent", "resolved")
 
         assert updated is False
 
-    def test_update_outcome_success(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test successfully updating a pattern's outcome."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
-
-        citations = [
-            Citation(
-                source_type="linear_issue",
-                source_id="ABC-500",
-                source_url="https://linear.app/issue/ABC-500",
-                excerpt="Test",
-            )
-        ]
-
-        # Record initial pattern
+    @pytest.mark.parametrize(
+        ("initial", "updates", "successes", "uses", "confidence"),
+        [
+            # Unresolved then resolved: 1 success / 2 uses
+            (None, ["resolved"], 1, 2, 0.5),
+            # Resolved then not resolved: successes unchanged, uses incremented
+            ("resolved", ["not_resolved"], 1, 2, 0.5),
+            # 1/1 -> 2/2 -> 2/3 -> 2/4
+            ("resolved", ["resolved", "not_resolved", "not_resolved"], 2, 4, 0.5),
+        ],
+    )
+    def test_update_outcome_recalculates_confidence(
+        self: "TestLearningStore",
+        store: LearningStore,
+        initial: str | None,
+        updates: list[str],
+        successes: int,
+        uses: int,
+        confidence: float,
+    ) -> None:
+        """Test that updates increment uses and recalculate confidence from the success rate."""
         pattern_id = store.record_pattern(
-            issue_pattern="initial issue",
-            recommendation="try something",
-            citations=citations,
-            outcome=None,
+            issue_pattern="recurring bug",
+            recommendation="apply patch",
+            citations=[_citation("ABC-500")],
+            outcome=initial,
         )
 
-        # Update outcome
-        updated = store.update_outcome(pattern_id, "resolved")
+        for outcome in updates:
+            assert store.update_outcome(pattern_id, outcome) is True
+
+        pattern = store._load_pattern(pattern_id)
+        assert pattern is not None
 
-        assert updated is True
+        assert pattern["outcome"] == updates[-1]
+        assert pattern["successful_resolutions"] == successes
+        assert pattern["total_uses"] == uses
+        assert pattern["confidence"] == confidence
 
-        # Verify file was updated
-        with open(patterns_file) as f:
-            pattern = json.loads(f.readline())
+    def test_update_outcome_appends_delta_without_rewrite(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that update_outcome appends to the delta log instead of rewriting patterns."""
+        ids = [store.record_pattern(f"pattern {i}", f"fix {i}", [], None) for i in range(3)]
+        original = store.patterns_file.read_bytes()
 
-        assert pattern["outcome"] == "resolved"
+        assert store.update_outcome(ids[0], "resolved") is True
+
+        assert store.patterns_file.read_bytes() == original
+        assert len(store.delta_file.read_text().splitlines()) == 1
+        pattern = store._load_pattern(ids[0])
+        assert pattern is not None
         assert pattern["successful_resolutions"] == 1
-        assert pattern["total_uses"] == 2  # Incremented from 1 to 2
-        assert pattern["confidence"] == 0.5  # 1 success / 2 uses
+        assert pattern["total_uses"] == 2
+
+    def test_compact_folds_delta_log(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that compact() folds deltas into the patterns file and removes the log."""
+        ids = [store.record_pattern(f"pattern {i}", f"fix {i}", [], None) for i in range(3)]
+        store.update_outcome(ids[1], "resolved")
+
+        store.compact()
+
+        assert not store.delta_file.exists()
+        with open(store.patterns_file, "rb") as f:
+            patterns = [orjson.loads(line) for line in f]
+        assert [p["pattern_id"] for p in patterns] == ids
+        assert patterns[1]["total_uses"] == 2
+        assert patterns[1]["successful_resolutions"] == 1
+        assert "confidence" not in patterns[1]
+
+    def test_update_outcome_does_not_read_store(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that update_outcome only appends, and unknown IDs are skipped on replay and compaction."""
+        ids = [store.record_pattern(f"pattern {i}", f"fix {i}", [], None) for i in range(3)]
+
+        with patch.object(store, "_load_patterns", wraps=store._load_patterns) as mock_load:
+            assert store.update_outcome(ids[0], "resolved") is True
+            assert store.update_outcome("P-unknown", "resolved") is True  # Not validated; skipped on replay
+        mock_load.assert_not_called()
+
+        store.compact()
+        with open(store.patterns_file, "rb") as f:
+            assert [orjson.loads(line)["pattern_id"] for line in f] == ids
+        pattern = store._load_pattern(ids[0])
+        assert pattern is not None
+        assert pattern["total_uses"] == 2
+
+    def test_lookup_compacts_large_delta_log(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that a lookup compacts the store once deltas outnumber half the patterns."""
+        ids = [store.record_pattern(f"compact pattern {i}", "fix", [], None) for i in range(3)]
+        store.update_outcome(ids[0], "resolved")
+        store.find_matching_patterns("compact pattern", min_confidence=0.5)
+        assert store.delta_file.exists()
+
+        store.update_outcome(ids[1], "resolved")
+        matches = store.find_matching_patterns("compact pattern", min_confidence=0.5)
+
+        assert not store.delta_file.exists()
+        assert not list(store.patterns_file.parent.glob("*.folding-*"))
+        assert [m.description for m in matches] == ["compact pattern 0", "compact pattern 1", "compact pattern 2"]
+
+    @pytest.mark.parametrize("crash_at", ["replace", "unlink"])
+    def test_compact_interrupted_counts_deltas_once(
+        self: "TestLearningStore", store: LearningStore, crash_at: str
+    ) -> None:
+        """Test that a compaction crashing before or after replacing the file never replays deltas twice."""
+        ids = [store.record_pattern(f"pattern {i}", f"fix {i}", [], None) for i in range(3)]
+        store.update_outcome(ids[0], "resolved")
+
+        with patch.object(Path, crash_at, side_effect=OSError("crash")), pytest.raises(OSError, match="crash"):
+            store.compact()
+        store.update_outcome(ids[0], "not_resolved")
+
+        for _ in range(2):  # Before and after a compaction that recovers the store
+            pattern = LearningStore(str(store.patterns_file))._load_pattern(ids[0])
+            assert pattern is not None
+            assert (pattern["successful_resolutions"], pattern["total_uses"]) == (1, 3)
+            store.compact()
+        assert not list(store.patterns_file.parent.glob("*.folding-*"))
+
+    def test_record_multiple_patterns_appends_to_file(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that multiple patterns are appended to JSONL file."""
+        citations = [_citation("P-MULTI")]
 
-    def test_update_outcome_increments_uses(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test that update_outcome increments total_uses."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
+        # Record three patterns
+        id1 = store.record_pattern("pattern 1", "fix 1", citations, None)
+        id2 = store.record_pattern("pattern 2", "fix 2", citations, "resolved")
+        id3 = store.record_pattern("pattern 3", "fix 3", citations, None)
 
-        citations = [
-            Citation(
-                source_type="pattern",
-                source_id="P-Y",
-                source_url="https://internal/P-Y",
-                excerpt="Test",
-            )
-        ]
+        # Read all lines
+        with open(store.patterns_file, "rb") as f:
+            lines = f.readlines()
 
-        pattern_id = store.record_pattern(
-            issue_pattern="recurring bug",
-            recommendation="apply patch",
-            citations=citations,
-            outcome="resolved",
+        assert len(lines) == 3
+        assert orjson.loads(lines[0])["pattern_id"] == id1
+        assert orjson.loads(lines[1])["pattern_id"] == id2
+        assert orjson.loads(lines[2])["pattern_id"] == id3
+
+    def test_record_patterns_batch(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that record_patterns appends every record and returns IDs in order."""
+        ids = store.record_patterns(
+            [
+                {"issue_pattern": "batch 1", "recommendation": "fix 1", "citations": []},
+                {"issue_pattern": "batch 2", "recommendation": "fix 2", "citations": [], "outcome": "resolved"},
+            ]
         )
 
-        # First update (not resolved)
-        store.update_outcome(pattern_id, "not_resolved")
+        with open(store.patterns_file, "rb") as f:
+            patterns = [orjson.loads(line) for line in f]
 
-        with open(patterns_file) as f:
-            pattern = json.loads(f.readline())
+        assert [p["pattern_id"] for p in patterns] == ids
+        loaded = [store._load_pattern(pattern_id) for pattern_id in ids]
+        assert [p["confidence"] for p in loaded if p is not None] == [0.5, 1.0]
 
-        assert pattern["total_uses"] == 2  # Was 1, now 2
-        assert pattern["successful_resolutions"] == 1  # No change
-        assert pattern["confidence"] == 0.5  # 1/2
+    def test_record_patterns_empty_batch(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that an empty batch writes nothing."""
+        assert store.record_patterns([]) == []
+        assert not store.patterns_file.exists()
 
-    def test_update_outcome_recalculates_confidence(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test that confidence is recalculated based on success rate."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
+    def test_find_matching_patterns_cached_until_store_changes(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that repeated queries hit the cache and writes invalidate it."""
+        pattern_id = store.record_pattern("cache pattern", "fix", [], "resolved")
 
-        citations = [
-            Citation(
-                source_type="pattern",
-                source_id="P-Z",
-                source_url="https://internal/P-Z",
-                excerpt="Test",
-            )
-        ]
+        with patch.object(store, "_load_patterns", wraps=store._load_patterns) as mock_load:
+            first = store.find_matching_patterns("cache pattern", min_confidence=0.7)
+            second = store.find_matching_patterns("cache pattern", min_confidence=0.7)
 
-        pattern_id = store.record_pattern(
-            issue_pattern="test pattern",
-            recommendation="test fix",
-            citations=citations,
-            outcome="resolved",  # 1 success, 1 use, confidence=1.0
-        )
+            assert mock_load.call_count == 1
+            assert first == second
 
-        # Add more uses
-        store.update_outcome(pattern_id, "resolved")  # 2 success, 2 uses, confidence=1.0
-        store.update_outcome(pattern_id, "not_resolved")  # 2 success, 3 uses, confidence=0.67
-        store.update_outcome(pattern_id, "not_resolved")  # 2 success, 4 uses, confidence=0.5
+            store.update_outcome(pattern_id, "not_resolved")
+            mock_load.reset_mock()
+            third = store.find_matching_patterns("cache pattern", min_confidence=0.7)
 
-        with open(patterns_file) as f:
-            pattern = json.loads(f.readline())
+        assert mock_load.call_count == 1
+        assert third == []  # Confidence dropped to 0.5 after failed outcome
 
-        assert pattern["successful_resolutions"] == 2
-        assert pattern["total_uses"] == 4
-        assert pattern["confidence"] == 0.5
+    def test_find_matching_patterns_cache_ignores_query_case(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that case variants of a query share one cached result."""
+        store.record_pattern("Cache Pattern", "fix", [], "resolved")
 
-    def test_record_multiple_patterns_appends_to_file(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test that multiple patterns are appended to JSONL file."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
+        first = store.find_matching_patterns("cache pattern", min_confidence=0.7)
+        second = store.find_matching_patterns("CACHE Pattern", min_confidence=0.7)
 
-        citations = [
-            Citation(
-                source_type="pattern",
-                source_id="P-MULTI",
-                source_url="https://internal/P-MULTI",
-                excerpt="Test",
-            )
-        ]
+        assert store._find_cached.cache_info().hits == 1
+        assert first == second
+        assert [m.description for m in second] == ["Cache Pattern"]
 
-        # Record three patterns
-        id1 = store.record_pattern("pattern 1", "fix 1", citations, None)
-        id2 = store.record_pattern("pattern 2", "fix 2", citations, "resolved")
-        id3 = store.record_pattern("pattern 3", "fix 3", citations, None)
+    def test_find_matching_patterns_returns_fresh_objects(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that editing a returned match does not leak into later results for the same query."""
+        store.record_pattern("database connection timeout", "fix", [_citation("ABC-300")], "resolved")
 
-        # Read all lines
-        with open(patterns_file) as f:
-            lines = f.readlines()
+        first = store.find_matching_patterns("database connection timeout")
+        first[0].citations.clear()
+        first[0].confidence = 0.0
 
-        assert len(lines) == 3
-        assert json.loads(lines[0])["pattern_id"] == id1
-        assert json.loads(lines[1])["pattern_id"] == id2
-        assert json.loads(lines[2])["pattern_id"] == id3
+        second = store.find_matching_patterns("database connection timeout")
 
-    def test_find_matching_patterns_with_citations(self: "TestLearningStore", tmp_path: Path) -> None:
-        """Test that found patterns include their citations."""
-        patterns_file = tmp_path / "patterns.jsonl"
-        store = LearningStore(patterns_file=str(patterns_file))
+        assert store._find_cached.cache_info().hits == 1
+        assert [c.source_id for c in second[0].citations] == ["ABC-300"]
+        assert second[0].confidence == 1.0
 
-        citations = [
-            Citation(
-                source_type="linear_issue",
-                source_id="ABC-600",
-                source_url="https://linear.app/issue/ABC-600",
-                excerpt="Original issue",
-            ),
-            Citation(
-                source_type="git_commit",
-                source_id="def456",
-                source_url="https://github.com/repo/commit/def456",
-                excerpt="Fix commit",
-            ),
-        ]
+    def test_find_matching_patterns_loads_once_per_store_state(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that distinct queries reuse the loaded records until the store changes."""
+        store.record_pattern("append pattern one", "fix", [], "resolved")
 
-        store.record_pattern(
-            issue_pattern="documented pattern with citations",
-            recommendation="follow documented fix",
-            citations=citations,
-            outcome="resolved",
+        with patch.object(store, "_load_patterns", wraps=store._load_patterns) as mock_load:
+            store.find_matching_patterns("append pattern", min_confidence=0.7)
+            store.find_matching_patterns("an append pattern one report", min_confidence=0.7)
+            assert mock_load.call_count == 1
+
+            store.record_patterns(
+                [
+                    {"issue_pattern": "append pattern two", "recommendation": "fix", "citations": []},
+                    {
+                        "issue_pattern": "append pattern three",
+                        "recommendation": "fix",
+                        "citations": [],
+                        "outcome": "resolved",
+                    },
+                ]
+            )
+            matches = store.find_matching_patterns("append pattern", min_confidence=0.5)
+
+        assert mock_load.call_count == 2
+        assert [m.description for m in matches] == ["append pattern one", "append pattern three", "append pattern two"]
+
+    def test_find_matching_patterns_append_during_load_not_duplicated(
+        self: "TestLearningStore", store: LearningStore
+    ) -> None:
+        """Test that a record appended after the state token but before the read is loaded once."""
+        store.record_pattern("db timeout", "fix", [], "resolved")
+        load_patterns = store._load_patterns
+
+        def load_after_concurrent_append() -> tuple:
+            store.record_pattern("db timeout two", "fix", [])
+            return load_patterns()
+
+        with patch.object(store, "_load_patterns", side_effect=load_after_concurrent_append) as mock_load:
+            store.find_matching_patterns("db timeout", min_confidence=0.5)
+            matches = store.find_matching_patterns("db timeout", min_confidence=0.4)
+
+        assert mock_load.call_count == 1
+        assert [m.description for m in matches] == ["db timeout", "db timeout two"]
+
+    @pytest.mark.parametrize(
+        ("texts", "query", "min_confidence", "expected"),
+        [
+            (["service crashes randomly", "memory leak"], "service crashes", 0.0, ["service crashes randomly"]),
+            (["connection timeout", "disk full"], "Users see a connection timeout", 0.0, ["connection timeout"]),
+            (["Database Timeout"], "database TIMEOUT", 0.0, ["Database Timeout"]),
+            (["5xx", "ui"], "returns 5xx in the ui", 0.0, ["5xx", "ui"]),
+            (["error type A occurs", "error type A"], "error type A", 0.0, ["error type A occurs", "error type A"]),
+            (["disk", "full"], "k\0f", 0.0, []),
+            (["slow query", "slow query plan", "slow"], "slow query", 0.7, ["slow query plan", "slow"]),
+        ],
+        ids=["query_in_pattern", "pattern_in_query", "case", "short_patterns", "ties", "no_straddle", "ranked"],
+    )
+    def test_scan(
+        self: "TestLearningStore", texts: list[str], query: str, min_confidence: float, expected: list[str]
+    ) -> None:
+        """Test containment in either direction, the confidence floor, and ranking."""
+        confidence = {"slow query": 0.6, "slow query plan": 0.9, "slow": 0.75}
+        patterns = [{"issue_pattern": text, "confidence": confidence.get(text, 1.0)} for text in texts]
+
+        assert [p["issue_pattern"] for p in _scan(patterns, query, min_confidence)] == expected
+
+    def test_unterminated_last_line_loaded_and_repaired(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that a patterns file ending without a newline keeps its last record and stays appendable."""
+        store.record_pattern("first pattern", "fix", [], "resolved")
+        store.patterns_file.write_bytes(store.patterns_file.read_bytes().rstrip(b"\n"))
+
+        assert [m.description for m in store.find_matching_patterns("first pattern")] == ["first pattern"]
+
+        store.record_pattern("second pattern", "fix", [], "resolved")
+
+        matches = store.find_matching_patterns("pattern")
+        assert [m.description for m in matches] == ["first pattern", "second pattern"]
+
+    def test_confidence_derived_from_counts_on_load(self: "TestLearningStore", store: LearningStore) -> None:
+        """Test that a stale stored confidence is ignored in favour of the resolution counts."""
+        store.patterns_file.write_bytes(
+            orjson.dumps(
+                {
+                    "pattern_id": "P-legacy",
+                    "issue_pattern": "legacy pattern",
+                    "recommendation": "fix",
+                    "citations": [],
+                    "outcome": "resolved",
+                    "successful_resolutions": 3,
+                    "total_uses": 4,
+                    "confidence": 0.1,
+                }
+            )
+            + b"\n"
         )
 
-        matches = store.find_matching_patterns("documented pattern", min_confidence=0.7)
+        matches = store.find_matching_patterns("legacy pattern", min_confidence=0.7)
 
-        assert len(matches) == 1
-        assert len(matches[0].citations) == 2
-        assert matches[0].citations[0].source_id == "ABC-600"
-        assert matches[0].citations[1].source_id == "def456"
+        assert [m.confidence for m in matches] == [0.75]
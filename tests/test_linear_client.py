@@ -1,37 +1,44 @@
 """Tests for Linear GraphQL API client."""
 
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 import requests
 
-from orchestrator.linear_client import fetch_issue, update_issue
+from orchestrator.linear_client import _get_api_key, _reset_api_key, fetch_issue, update_issue
+
+
+@pytest.fixture(autouse=True)
+def reset_api_key():
+    """Clear the cached API key so each test sees its patched environment."""
+    _reset_api_key()
+    yield
+    _reset_api_key()
 
 
 class TestFetchIssue:
     """Test fetch_issue() function."""
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
-    def test_fetch_issue_success(self, mock_post):
+    def test_fetch_issue_success(self, mock_post, make_resp):
         """Test successful issue fetch from Linear API."""
         # Mock successful API response
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "data": {
-                "issue": {
-                    "id": "SP-1242",
-                    "title": "Test bug",
-                    "description": "Bug description",
-                    "priority": 2,
-                    "state": {"name": "In Progress"},
-                    "team": {"key": "SP"},
+        mock_post.return_value = make_resp(
+            {
+                "data": {
+                    "issue": {
+                        "id": "SP-1242",
+                        "title": "Test bug",
+                        "description": "Bug description",
+                        "priority": 2,
+                        "state": {"name": "In Progress"},
+                        "team": {"key": "SP"},
+                    }
                 }
             }
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
+        )
 
         result = fetch_issue("SP-1242")
 
@@ -44,38 +51,34 @@ class TestFetchIssue:
         mock_post.assert_called_once()
         call_args = mock_post.call_args
         assert call_args.kwargs["headers"]["Authorization"] == "test_api_key"
-        assert "issue(id:" in call_args.kwargs["json"]["query"]
+        assert "issue(id: $id)" in call_args.kwargs["json"]["query"]
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
-    def test_fetch_issue_not_found(self, mock_post):
+    def test_fetch_issue_not_found(self, mock_post, make_resp):
         """Test error handling when issue not found."""
         # Mock API response with no issue
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"data": {"issue": None}}
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
+        mock_post.return_value = make_resp({"data": {"issue": None}})
 
         with pytest.raises(RuntimeError, match="Issue SP-999 not found"):
             fetch_issue("SP-999")
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
-    def test_fetch_issue_api_error(self, mock_post):
+    def test_fetch_issue_api_error(self, mock_post, make_resp):
         """Test error handling when API returns GraphQL errors."""
         # Mock API response with errors
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "errors": [{"message": "Invalid issue ID"}],
-            "data": None,
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
+        mock_post.return_value = make_resp(
+            {
+                "errors": [{"message": "Invalid issue ID"}],
+                "data": None,
+            }
+        )
 
         with pytest.raises(RuntimeError, match="Linear API returned errors"):
             fetch_issue("INVALID")
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
     def test_fetch_issue_network_error(self, mock_post):
         """Test error handling for network failures."""
@@ -94,34 +97,15 @@ class TestFetchIssue:
 class TestUpdateIssue:
     """Test update_issue() function."""
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
-    def test_update_issue_success(self, mock_post):
+    def test_update_issue_success(self, mock_post, make_resp, enable_linear_writes):
         """Test successful issue update and comment creation."""
         # Mock both mutations (priority update and comment creation)
-        update_response = MagicMock()
-        update_response.json.return_value = {
-            "data": {
-                "issueUpdate": {
-                    "success": True,
-                    "issue": {"id": "SP-1242", "priority": 2},
-                }
-            }
-        }
-        update_response.raise_for_status = MagicMock()
-
-        comment_response = MagicMock()
-        comment_response.json.return_value = {
-            "data": {
-                "commentCreate": {
-                    "success": True,
-                    "comment": {"id": "comment-123"},
-                }
-            }
-        }
-        comment_response.raise_for_status = MagicMock()
-
-        mock_post.side_effect = [update_response, comment_response]
+        mock_post.side_effect = [
+            make_resp({"data": {"issueUpdate": {"success": True, "issue": {"id": "SP-1242", "priority": 2}}}}),
+            make_resp({"data": {"commentCreate": {"success": True, "comment": {"id": "comment-123"}}}}),
+        ]
 
         update_issue("SP-1242", 2, "AI analysis comment")
 
@@ -138,59 +122,54 @@ class TestUpdateIssue:
         assert "commentCreate" in second_call.kwargs["json"]["query"]
         assert second_call.kwargs["json"]["variables"]["body"] == "AI analysis comment"
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
-    def test_update_issue_priority_failure(self, mock_post):
+    def test_update_issue_priority_failure(self, mock_post, make_resp, enable_linear_writes):
         """Test error handling when priority update fails."""
         # Mock failed priority update
-        mock_response = MagicMock()
-        mock_response.json.return_value = {
-            "data": {
-                "issueUpdate": {
-                    "success": False,
+        mock_post.return_value = make_resp(
+            {
+                "data": {
+                    "issueUpdate": {
+                        "success": False,
+                    }
                 }
             }
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_post.return_value = mock_response
+        )
 
         with pytest.raises(RuntimeError, match="Failed to update issue SP-1242 priority"):
             update_issue("SP-1242", 2, "Comment")
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
-    def test_update_issue_comment_failure(self, mock_post):
-        """Test error handling when comment creation fails."""
-        # Mock successful priority update but failed comment
-        update_response = MagicMock()
-        update_response.json.return_value = {
-            "data": {
-                "issueUpdate": {
-                    "success": True,
-                    "issue": {"id": "SP-1242", "priority": 2},
-                }
-            }
-        }
-        update_response.raise_for_status = MagicMock()
+    def test_update_issue_priority_error_skips_comment(self, mock_post, make_resp, enable_linear_writes):
+        """Test that a priority update rejected with GraphQL errors never posts the comment."""
+        mock_post.return_value = make_resp(
+            {"errors": [{"message": "Priority out of range"}], "data": {"issueUpdate": None}}
+        )
 
-        comment_response = MagicMock()
-        comment_response.json.return_value = {
-            "data": {
-                "commentCreate": {
-                    "success": False,
-                }
-            }
-        }
-        comment_response.raise_for_status = MagicMock()
+        with pytest.raises(RuntimeError, match="Priority out of range"):
+            update_issue("SP-1242", 2, "Comment")
 
-        mock_post.side_effect = [update_response, comment_response]
+        assert mock_post.call_count == 1
+        assert "commentCreate" not in mock_post.call_args.kwargs["json"]["query"]
+
+    @patch("orchestrator.linear_client._SESSION.post")
+    @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
+    def test_update_issue_comment_failure(self, mock_post, make_resp, enable_linear_writes):
+        """Test error handling when comment creation fails."""
+        # Mock successful priority update but failed comment
+        mock_post.side_effect = [
+            make_resp({"data": {"issueUpdate": {"success": True, "issue": {"id": "SP-1242", "priority": 2}}}}),
+            make_resp({"data": {"commentCreate": {"success": False}}}),
+        ]
 
         with pytest.raises(RuntimeError, match="Failed to add comment to issue SP-1242"):
             update_issue("SP-1242", 2, "Comment")
 
-    @patch("orchestrator.linear_client.requests.post")
+    @patch("orchestrator.linear_client._SESSION.post")
     @patch.dict(os.environ, {"LINEAR_API_KEY": "test_api_key"})
-    def test_update_issue_network_error(self, mock_post):
+    def test_update_issue_network_error(self, mock_post, enable_linear_writes):
         """Test error handling for network failures during update."""
         mock_post.side_effect = requests.exceptions.Timeout("Request timeout")
 
@@ -213,10 +192,19 @@ class TestUpdateIssue:
             "issueUpdate": {"success": True, "issue": {"id": "SP-123", "priority": 2}},
             "commentCreate": {"success": True, "comment": {"id": "comment-123"}},
         }
-        # Call function twice for both mutations
-        mock_request.side_effect = [
-            {"issueUpdate": {"success": True, "issue": {"id": "SP-123", "priority": 2}}},
-            {"commentCreate": {"success": True, "comment": {"id": "comment-123"}}},
-        ]
         update_issue("SP-123", priority=2, comment="test")
-        assert mock_request.call_count == 2  # priority + comment
+        assert mock_request.call_count == 2  # priority update, then comment
+
+
+class TestGetApiKey:
+    """Test _get_api_key() caching."""
+
+    def test_api_key_cached_after_first_lookup(self):
+        """Test that the key is read from the environment once and then reused."""
+        with patch.dict(os.environ, {"LINEAR_API_KEY": "first_key"}):
+            assert _get_api_key() == "first_key"
+
+        with patch.dict(os.environ, {"LINEAR_API_KEY": "second_key"}):
+            assert _get_api_key() == "first_key"
+            _reset_api_key()
+            assert _get_api_key() == "second_key"
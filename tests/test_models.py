@@ -35,17 +35,11 @@ def test_severity_analysis_valid(severity_analysis):
     assert "Backend" in analysis.required_expertise
 
 
-def test_severity_analysis_all_priorities():
+@pytest.mark.parametrize("priority", ["P0", "P1", "P2", "P3"])
+def test_severity_analysis_all_priorities(priority):
     """Test SeverityAnalysis accepts all valid priority levels."""
-    for priority in ["P0", "P1", "P2", "P3"]:
-        data = {
-            "severity": priority,
-            "complexity": "simple",
-            "required_expertise": [],
-            "reasoning": "Test",
-        }
-        analysis = SeverityAnalysis(**data)
-        assert analysis.severity == priority
+    analysis = SeverityAnalysis(severity=priority, complexity="simple", required_expertise=[], reasoning="Test")
+    assert analysis.severity == priority
 
 
 def test_severity_analysis_invalid_severity():
@@ -77,8 +71,9 @@ def test_triage_result_success(validity_analysis, severity_analysis):
     result = TriageResult(
         ticket_id="ABC-123",
         ticket_url="https://linear.app/issue/ABC-123",
-        validity=ValidityAnalysis(**validity_analysis),
-        severity=SeverityAnalysis(**severity_analysis),
+        # Nested models are validated by their own tests; skip re-running validators here
+        validity=ValidityAnalysis.model_construct(**validity_analysis),
+        severity=SeverityAnalysis.model_construct(**severity_analysis),
         ai_comment="Test comment",
         success=True,
         duration=23.5,